@@ -5,21 +5,72 @@ Advanced Features Module - Additional functionality for the Image Converter.
 
 import customtkinter as ctk
 from PIL import Image, ImageTk
+import numpy as np
 import tkinter as tk
 from tkinter import messagebox
 import os
-from pathlib import Path
+import sys
+import time
+import datetime
+import functools
+from collections import deque
 import threading
-from typing import Optional, Dict, Any, List
+import queue
+from typing import Optional, Dict, Any, Tuple
 import logging
 
+# Maximum size of the preview image (width, height)
+PREVIEW_BOX = (600, 400)
+
+# Number of conversions kept by ConversionHistory
+HISTORY_LIMIT = 100
+
+
+@functools.lru_cache(maxsize=32)
+def _get_thumbnail(path: str, mtime: float, file_size: int,
+                   box: Tuple[int, int]) -> Tuple[Image.Image, Dict[str, Any]]:
+    """
+    Load an image resized to fit inside box, cached by path, mtime and size
+    
+    Entries outlive the preview window that loaded them, since previews are
+    modal and a repeat preview always opens after the last one closed; the
+    LRU bound keeps at most 32 box-sized thumbnails alive.
+    
+    Returns:
+        Tuple of the resized image and the source image metadata
+        (format, width, height, mode, file_size), read from the same open
+    """
+    with Image.open(path) as img:
+        # Capture metadata before draft() changes the reported size and mode
+        meta = {
+            'format': img.format,
+            'width': img.width,
+            'height': img.height,
+            'mode': img.mode,
+            'file_size': file_size
+        }
+        
+        # Let libjpeg decode at a reduced DCT scale instead of full resolution
+        if img.format == "JPEG":
+            img.draft("RGB", box)
+        
+        # Resize image for display, maintaining aspect ratio
+        img.thumbnail(box, Image.Resampling.LANCZOS)
+        return img, meta
+
+
 class ImagePreviewWindow:
     """A window to preview images before and after conversion"""
     
+    # One PhotoImage per Tk interpreter (keyed by parent widget) that every preview
+    # pastes into; previews are modal, so the buffer is never shown twice at once
+    _photo_buffers: Dict[int, ImageTk.PhotoImage] = {}
+    
     def __init__(self, parent, image_path: str):
         self.parent = parent
         self.image_path = image_path
         self.preview_window = None
+        self.image_meta = None
         self.logger = logging.getLogger(__name__)
         
     def show_preview(self):
@@ -47,69 +98,117 @@ class ImagePreviewWindow:
             image_frame = ctk.CTkFrame(main_frame)
             image_frame.pack(fill="both", expand=True, pady=(0, 10))
             
-            # Load and display image
-            self.display_image(image_frame)
+            # Placeholder shown until the image has been loaded
+            loading_label = ctk.CTkLabel(image_frame, text="Loading...")
+            loading_label.pack(expand=True)
             
-            # Image info
-            self.display_image_info(main_frame)
-            
-            # Close button
+            # Close button (packed at the bottom so the info line can be added later)
             close_btn = ctk.CTkButton(
                 main_frame,
                 text="Close",
                 command=self.close_preview,
                 width=100
             )
-            close_btn.pack(pady=10)
+            close_btn.pack(side="bottom", pady=10)
+            
+            # Load the image once the window has been drawn
+            self.preview_window.after_idle(self._populate, image_frame, main_frame, loading_label)
             
         except Exception as e:
             self.logger.error(f"Error showing preview: {str(e)}")
             messagebox.showerror("Preview Error", f"Could not show preview: {str(e)}")
             
-    def display_image(self, parent):
+    def _populate(self, image_frame, info_parent, loading_label):
+        """Start loading the image into an already visible preview window"""
+        if not self.preview_window or not self.preview_window.winfo_exists():
+            return
+            
+        # Decode and resize on a worker thread; Tk objects are only touched here
+        load_queue = queue.SimpleQueue()
+        threading.Thread(target=self._decode, args=(load_queue,), daemon=True).start()
+        self.preview_window.after(50, self._check_decode, load_queue, image_frame, info_parent, loading_label)
+        
+    def _decode(self, load_queue: queue.SimpleQueue):
+        """Decode and resize the image (runs in a worker thread, no Tk calls)"""
+        try:
+            stat = os.stat(self.image_path)
+            thumbnail, meta = _get_thumbnail(
+                self.image_path, stat.st_mtime, stat.st_size, PREVIEW_BOX
+            )
+            
+            # Center the thumbnail on a box-sized canvas so it fits the shared buffer
+            thumbnail = thumbnail.convert("RGBA")
+            display_img = Image.new("RGB", PREVIEW_BOX, "white")
+            offset = ((PREVIEW_BOX[0] - thumbnail.width) // 2, (PREVIEW_BOX[1] - thumbnail.height) // 2)
+            display_img.paste(thumbnail, offset, thumbnail)
+            
+            load_queue.put(("loaded", display_img, meta))
+        except Exception as e:
+            load_queue.put(("error", e))
+            
+    def _check_decode(self, load_queue: queue.SimpleQueue, image_frame, info_parent, loading_label):
+        """Install the decoded image once the worker thread has finished"""
+        if not self.preview_window or not self.preview_window.winfo_exists():
+            return
+            
+        # This is the only consumer, so a non-empty queue can be read without blocking
+        if load_queue.empty():
+            self.preview_window.after(50, self._check_decode, load_queue, image_frame, info_parent, loading_label)
+            return
+        message_type, *data = load_queue.get()
+        
+        loading_label.destroy()
+        
+        if message_type == "loaded":
+            display_img, self.image_meta = data
+            
+            # Display image
+            self.display_image(image_frame, display_img)
+            
+            # Image info
+            self.display_image_info(info_parent, self.image_meta)
+        else:
+            self.display_load_error(image_frame, data[0])
+            
+    def display_image(self, parent, display_img: Image.Image):
         """Display the image in the preview window"""
         try:
-            # Load image
-            with Image.open(self.image_path) as img:
-                # Calculate display size (max 600x400)
-                display_width, display_height = 600, 400
-                img_width, img_height = img.size
-                
-                # Maintain aspect ratio
-                ratio = min(display_width / img_width, display_height / img_height)
-                new_width = int(img_width * ratio)
-                new_height = int(img_height * ratio)
-                
-                # Resize image for display
-                display_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                
-                # Convert to PhotoImage
-                photo = ImageTk.PhotoImage(display_img)
-                
-                # Display image
-                img_label = tk.Label(parent, image=photo, bg="white")
-                img_label.image = photo  # Keep a reference
-                img_label.pack(expand=True)
+            # Overwrite the pixels of the shared PhotoImage instead of allocating
+            # a new one per preview, which leaks Tk image memory
+            photo = self._photo_buffers.get(id(self.parent))
+            if photo is None:
+                photo = ImageTk.PhotoImage(Image.new("RGB", PREVIEW_BOX, "white"))
+                self._photo_buffers[id(self.parent)] = photo
+            photo.paste(display_img)
+            
+            # Display image
+            img_label = tk.Label(parent, image=photo, bg="white")
+            img_label.image = photo  # Keep a reference
+            img_label.pack(expand=True)
                 
         except Exception as e:
-            self.logger.error(f"Error displaying image: {str(e)}")
-            error_label = ctk.CTkLabel(parent, text=f"Could not load image:\n{str(e)}")
-            error_label.pack(expand=True)
+            self.display_load_error(parent, e)
+            
+    def display_load_error(self, parent, error: Exception):
+        """Show an error message in place of the image"""
+        self.logger.error(f"Error displaying image: {str(error)}")
+        error_label = ctk.CTkLabel(parent, text=f"Could not load image:\n{str(error)}")
+        error_label.pack(expand=True)
             
-    def display_image_info(self, parent):
+    def display_image_info(self, parent, meta: Optional[Dict[str, Any]]):
         """Display image information"""
+        if not meta:
+            return
+            
         try:
-            with Image.open(self.image_path) as img:
-                file_size = os.path.getsize(self.image_path)
-                
-                info_frame = ctk.CTkFrame(parent)
-                info_frame.pack(fill="x", pady=(0, 10))
-                
-                info_text = f"Format: {img.format} | Size: {img.width}x{img.height} | Mode: {img.mode} | File Size: {self.format_file_size(file_size)}"
-                
-                info_label = ctk.CTkLabel(info_frame, text=info_text)
-                info_label.pack(pady=10)
-                
+            info_frame = ctk.CTkFrame(parent)
+            info_frame.pack(fill="x", pady=(0, 10))
+            
+            info_text = f"Format: {meta['format']} | Size: {meta['width']}x{meta['height']} | Mode: {meta['mode']} | File Size: {self.format_file_size(meta['file_size'])}"
+            
+            info_label = ctk.CTkLabel(info_frame, text=info_text)
+            info_label.pack(pady=10)
+            
         except Exception as e:
             self.logger.error(f"Error getting image info: {str(e)}")
             
@@ -118,15 +217,13 @@ class ImagePreviewWindow:
         if size_bytes == 0:
             return "0 B"
         size_names = ["B", "KB", "MB", "GB"]
-        i = 0
-        size = float(size_bytes)
-        while size >= 1024.0 and i < len(size_names) - 1:
-            size /= 1024.0
-            i += 1
+        # Each unit is 2**10 larger, so the bit length picks the unit directly
+        i = min((size_bytes.bit_length() - 1) // 10, len(size_names) - 1)
+        size = size_bytes / (1 << (10 * i))
         return f"{size:.1f} {size_names[i]}"
         
     def close_preview(self):
-        """Close the preview window"""
+        """Close the preview window (the cached thumbnail is kept for the next preview)"""
         if self.preview_window:
             self.preview_window.grab_release()
             self.preview_window.destroy()
@@ -286,86 +383,151 @@ class BatchProcessingOptions:
         }
 
 
+class ConversionEntry:
+    """
+    A single conversion history record
+    
+    Entries used to be dicts; item access with the old keys (entry['source_path'],
+    dict(entry)) still works, and entry['timestamp'] is still a datetime.
+    """
+    
+    __slots__ = (
+        'timestamp', 'source_dir', 'source_filename', 'target_dir', 'target_filename',
+        'success', 'conversion_time', 'file_size_before', 'file_size_after', 'compression_ratio'
+    )
+    
+    # Keys of the dict entries this class replaced
+    _KEYS = (
+        'timestamp', 'source_path', 'target_path', 'source_filename', 'target_filename',
+        'success', 'conversion_time', 'file_size_before', 'file_size_after', 'compression_ratio'
+    )
+    
+    def __init__(self, timestamp: float, source_path: str, target_path: str, success: bool,
+                 conversion_time: float, file_size_before: int, file_size_after: int):
+        self.timestamp = timestamp
+        # Batches share a handful of folders, so store each directory string only once
+        self.source_dir = sys.intern(os.path.dirname(source_path))
+        self.source_filename = os.path.basename(source_path)
+        self.target_dir = sys.intern(os.path.dirname(target_path))
+        self.target_filename = os.path.basename(target_path)
+        self.success = success
+        self.conversion_time = conversion_time
+        self.file_size_before = file_size_before
+        self.file_size_after = file_size_after
+        self.compression_ratio = file_size_after / file_size_before if file_size_before > 0 else 1.0
+        
+    @property
+    def source_path(self) -> str:
+        """Full path of the source file"""
+        return os.path.join(self.source_dir, self.source_filename)
+        
+    @property
+    def target_path(self) -> str:
+        """Full path of the converted file"""
+        return os.path.join(self.target_dir, self.target_filename)
+        
+    def keys(self) -> Tuple[str, ...]:
+        """The dict-style keys, so dict(entry) gives the old dict entry"""
+        return self._KEYS
+        
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        if key == 'timestamp':
+            return datetime.datetime.fromtimestamp(self.timestamp)
+        return getattr(self, key)
+
+
 class ConversionHistory:
     """Manages conversion history and statistics"""
     
     def __init__(self):
-        self.history = []
+        # Keep only last 100 entries; older ones are dropped on append
+        self.history = deque(maxlen=HISTORY_LIMIT)
+        
+        # Numeric fields mirrored column-wise in ring buffers so statistics are vectorized.
+        # The slot being overwritten always holds the entry the deque just evicted.
+        self._columns = {
+            'success': np.zeros(HISTORY_LIMIT, dtype=np.bool_),
+            'conversion_time': np.zeros(HISTORY_LIMIT, dtype=np.float64),
+            'file_size_before': np.zeros(HISTORY_LIMIT, dtype=np.int64),
+            'file_size_after': np.zeros(HISTORY_LIMIT, dtype=np.int64),
+            'compression_ratio': np.zeros(HISTORY_LIMIT, dtype=np.float64),
+        }
+        self._next_slot = 0
         self.logger = logging.getLogger(__name__)
         
     def add_conversion(self, source_path: str, target_path: str, success: bool, 
                       conversion_time: float, file_size_before: int, file_size_after: int):
         """Add a conversion to the history"""
-        import datetime
-        
-        entry = {
-            'timestamp': datetime.datetime.now(),
-            'source_path': source_path,
-            'target_path': target_path,
-            'source_filename': os.path.basename(source_path),
-            'target_filename': os.path.basename(target_path),
-            'success': success,
-            'conversion_time': conversion_time,
-            'file_size_before': file_size_before,
-            'file_size_after': file_size_after,
-            'compression_ratio': file_size_after / file_size_before if file_size_before > 0 else 1.0
-        }
+        entry = ConversionEntry(
+            time.time(), source_path, target_path, success,
+            conversion_time, file_size_before, file_size_after
+        )
         
         self.history.append(entry)
         
-        # Keep only last 100 entries
-        if len(self.history) > 100:
-            self.history = self.history[-100:]
+        for name, column in self._columns.items():
+            column[self._next_slot] = getattr(entry, name)
+        self._next_slot = (self._next_slot + 1) % HISTORY_LIMIT
             
     def get_statistics(self) -> Dict[str, Any]:
         """Get conversion statistics"""
         if not self.history:
             return {}
             
-        successful = [entry for entry in self.history if entry['success']]
-        failed = [entry for entry in self.history if not entry['success']]
+        # Until the ring buffers wrap, only the first len(history) slots are filled
+        total = len(self.history)
+        columns = {name: column[:total] for name, column in self._columns.items()}
+        ok = columns['success']
         
-        total_time = sum(entry['conversion_time'] for entry in successful)
-        total_size_before = sum(entry['file_size_before'] for entry in successful)
-        total_size_after = sum(entry['file_size_after'] for entry in successful)
+        successful = int(np.count_nonzero(ok))
+        total_time = float(columns['conversion_time'][ok].sum())
+        total_size_before = int(columns['file_size_before'][ok].sum())
+        total_size_after = int(columns['file_size_after'][ok].sum())
+        total_compression_ratio = float(columns['compression_ratio'][ok].sum())
         
         return {
-            'total_conversions': len(self.history),
-            'successful_conversions': len(successful),
-            'failed_conversions': len(failed),
-            'success_rate': len(successful) / len(self.history) * 100,
+            'total_conversions': total,
+            'successful_conversions': successful,
+            'failed_conversions': total - successful,
+            'success_rate': successful / total * 100,
             'total_time': total_time,
-            'average_time': total_time / len(successful) if successful else 0,
+            'average_time': total_time / successful if successful else 0,
             'total_size_saved': total_size_before - total_size_after,
-            'average_compression_ratio': sum(entry['compression_ratio'] for entry in successful) / len(successful) if successful else 1.0
+            'average_compression_ratio': total_compression_ratio / successful if successful else 1.0
         }
         
     def clear_history(self):
         """Clear the conversion history"""
         self.history.clear()
+        self._next_slot = 0
         
     def export_history(self, file_path: str):
         """Export history to a CSV file"""
         try:
             import csv
+            import datetime
             
             with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
                 fieldnames = ['timestamp', 'source_filename', 'target_filename', 'success', 
                              'conversion_time', 'file_size_before', 'file_size_after', 'compression_ratio']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer = csv.writer(csvfile)
                 
-                writer.writeheader()
-                for entry in self.history:
-                    writer.writerow({
-                        'timestamp': entry['timestamp'].isoformat(),
-                        'source_filename': entry['source_filename'],
-                        'target_filename': entry['target_filename'],
-                        'success': entry['success'],
-                        'conversion_time': f"{entry['conversion_time']:.3f}",
-                        'file_size_before': entry['file_size_before'],
-                        'file_size_after': entry['file_size_after'],
-                        'compression_ratio': f"{entry['compression_ratio']:.3f}"
-                    })
+                writer.writerow(fieldnames)
+                writer.writerows(
+                    (
+                        datetime.datetime.fromtimestamp(entry.timestamp).isoformat(),
+                        entry.source_filename,
+                        entry.target_filename,
+                        entry.success,
+                        f"{entry.conversion_time:.3f}",
+                        entry.file_size_before,
+                        entry.file_size_after,
+                        f"{entry.compression_ratio:.3f}"
+                    )
+                    for entry in self.history
+                )
                     
             return True
             
@@ -15,9 +15,8 @@ def build_executable():
     main_script = script_dir / "main.py"
     icon_file = script_dir / "app_icon.ico"
     
-    # PyInstaller command
-    cmd = [
-        sys.executable, "-m", "PyInstaller",
+    # PyInstaller arguments
+    args = [
         "--onefile",  # Single executable file
         "--windowed",  # No console window (for GUI)
         "--name", "ImageConverter",  # Executable name
@@ -31,20 +30,55 @@ def build_executable():
     ]
     
     print("Building executable with PyInstaller...")
-    print(f"Command: {' '.join(cmd)}")
     
-    try:
-        # Run PyInstaller
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print("Build successful!")
-        print(f"Executable created in: {script_dir / 'dist'}")
+    # Run PyInstaller in-process unless an isolated build is requested
+    if os.environ.get("IMAGE_CONVERTER_BUILD_SUBPROCESS"):
+        success = run_pyinstaller_subprocess(args)
+    else:
+        success = run_pyinstaller_in_process(args)
+        
+    if not success:
+        return False
         
-        # Show the output location
-        exe_path = script_dir / "dist" / "ImageConverter.exe"
-        if exe_path.exists():
-            print(f"Executable path: {exe_path}")
-            print(f"File size: {exe_path.stat().st_size / (1024*1024):.1f} MB")
+    print("Build successful!")
+    print(f"Executable created in: {script_dir / 'dist'}")
+    
+    # Show the output location
+    exe_path = script_dir / "dist" / "ImageConverter.exe"
+    if exe_path.exists():
+        print(f"Executable path: {exe_path}")
+        print(f"File size: {exe_path.stat().st_size / (1024*1024):.1f} MB")
         
+    return True
+
+def run_pyinstaller_in_process(args):
+    """Run PyInstaller inside the current interpreter"""
+    print(f"Arguments: {' '.join(args)}")
+    
+    try:
+        from PyInstaller.__main__ import run as pyi_run
+        pyi_run(args)
+    except ImportError as e:
+        print(f"Build failed: PyInstaller is not installed ({e})")
+        return False
+    except SystemExit as e:
+        # PyInstaller exits with a non-zero code on fatal errors
+        if e.code:
+            print(f"Build failed with exit code: {e.code}")
+            return False
+    except Exception as e:
+        print(f"Build failed with error: {e}")
+        return False
+        
+    return True
+
+def run_pyinstaller_subprocess(args):
+    """Run PyInstaller in a separate interpreter for an isolated build"""
+    cmd = [sys.executable, "-m", "PyInstaller", *args]
+    print(f"Command: {' '.join(cmd)}")
+    
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
     except subprocess.CalledProcessError as e:
         print(f"Build failed with error: {e}")
         print(f"stdout: {e.stdout}")
@@ -3,67 +3,122 @@
 Create a simple app icon for the Image Converter.
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+import numpy as np
 import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
-def create_app_icon():
-    """Create a simple app icon"""
-    
-    # Create a new image with a gradient background
-    size = 256
-    image = Image.new('RGB', (size, size), color='#1f538d')
-    draw = ImageDraw.Draw(image)
-    
-    # Create a subtle gradient effect
-    for i in range(size):
-        alpha = int(255 * (1 - i / size) * 0.3)
-        color = (31 + alpha//4, 83 + alpha//4, 141 + alpha//4)
-        draw.line([(0, i), (size, i)], fill=color)
+# Bump the version literal whenever the drawing code changes so cached icons are rebuilt
+ICON_STAMP = hashlib.sha1(b"v1:gradient+arrows+IMG").hexdigest()
+
+# Side length of the two image symbols on the 256px icon
+IMG_SIZE = 40
+
+def is_icon_current(ico_path, png_path, stamp_path):
+    """Check whether the icon files exist and were drawn by the current code"""
+    if not os.path.exists(ico_path) or (png_path and not os.path.exists(png_path)):
+        return False
+    try:
+        with open(stamp_path, 'r') as f:
+            return f.read().strip() == ICON_STAMP
+    except OSError:
+        return False
+
+def paint_symbols(image):
+    """Paint the two image icons and the conversion arrow onto the icon background
     
-    # Draw a rounded rectangle background
-    margin = 20
-    corner_radius = 30
+    Gives the same pixels as the ImageDraw rectangle, line and polygon calls it
+    replaces, with the axis-aligned shapes painted as array slices.
+    """
+    size = image.width
     
-    # Create rounded rectangle
-    rect_coords = [margin, margin, size - margin, size - margin]
-    draw.rounded_rectangle(rect_coords, corner_radius, fill='#4a9eff', outline='#ffffff', width=3)
-    
-    # Draw conversion arrows
+    # Precompute the geometry of both image icons and the arrow
     arrow_color = '#ffffff'
+    corner_color = '#cccccc'
     center_x, center_y = size // 2, size // 2
     
-    # Draw image icon (rectangle with corner)
-    img_size = 40
+    img_size = IMG_SIZE
     img_x1 = center_x - img_size - 10
     img_y1 = center_y - img_size // 2
     img_x2 = img_x1 + img_size
     img_y2 = img_y1 + img_size
     
-    # Left image
-    draw.rectangle([img_x1, img_y1, img_x2, img_y2], fill=arrow_color, outline='#cccccc', width=2)
-    draw.polygon([img_x2-12, img_y1, img_x2, img_y1, img_x2, img_y1+12], fill='#cccccc')
-    
-    # Arrow
     arrow_width = 30
     arrow_y = center_y
     arrow_start_x = img_x2 + 8
     arrow_end_x = arrow_start_x + arrow_width
     
-    # Arrow shaft
-    draw.line([(arrow_start_x, arrow_y), (arrow_end_x - 8, arrow_y)], fill=arrow_color, width=4)
+    img_x3 = arrow_end_x + 8
+    img_x4 = img_x3 + img_size
     
-    # Arrow head
-    draw.polygon([
+    # Rectangles and the arrow shaft are axis-aligned, so paint them as array slices
+    canvas = np.array(image)
+    arrow_rgb = ImageColor.getrgb(arrow_color)
+    corner_rgb = ImageColor.getrgb(corner_color)
+    
+    for x1, x2 in ((img_x1, img_x2), (img_x3, img_x4)):
+        # Image icon with a 2px outline
+        canvas[img_y1:img_y2 + 1, x1:x2 + 1] = corner_rgb
+        canvas[img_y1 + 2:img_y2 - 1, x1 + 2:x2 - 1] = arrow_rgb
+        
+    # Arrow shaft (4px wide line)
+    canvas[arrow_y - 1:arrow_y + 3, arrow_start_x:arrow_end_x - 8 + 1] = arrow_rgb
+    
+    # Rasterize all triangles into one label mask: 1 = folded corners, 2 = arrow head
+    mask = Image.new('L', (size, size), 0)
+    mask_draw = ImageDraw.Draw(mask)
+    for x in (img_x2, img_x4):
+        mask_draw.polygon([x-12, img_y1, x, img_y1, x, img_y1+12], fill=1)
+    mask_draw.polygon([
         (arrow_end_x - 8, arrow_y - 8),
         (arrow_end_x, arrow_y),
         (arrow_end_x - 8, arrow_y + 8)
-    ], fill=arrow_color)
+    ], fill=2)
     
-    # Right image
-    img_x3 = arrow_end_x + 8
-    img_x4 = img_x3 + img_size
-    draw.rectangle([img_x3, img_y1, img_x4, img_y2], fill=arrow_color, outline='#cccccc', width=2)
-    draw.polygon([img_x4-12, img_y1, img_x4, img_y1, img_x4, img_y1+12], fill='#cccccc')
+    labels = np.asarray(mask)
+    canvas[labels == 1] = corner_rgb
+    canvas[labels == 2] = arrow_rgb
+    
+    return Image.fromarray(canvas, 'RGB')
+
+def create_app_icon(force=False, make_png=False):
+    """Create a simple app icon (skipped if an up-to-date icon already exists)
+    
+    The PNG copy is only written when make_png is set; the build only needs the ICO.
+    """
+    
+    ico_path = os.path.join(os.path.dirname(__file__), "app_icon.ico")
+    png_path = os.path.join(os.path.dirname(__file__), "app_icon.png") if make_png else None
+    stamp_path = ico_path + ".stamp"
+    
+    if not force and is_icon_current(ico_path, png_path, stamp_path):
+        print(f"Icon up to date: {ico_path}")
+        return ico_path
+    
+    # Create a new image with a subtle vertical gradient background
+    size = 256
+    rows = np.arange(size, dtype=np.float64)[:, None, None]
+    alpha = (255 * (1 - rows / size) * 0.3).astype(np.int32)
+    base_color = np.array([31, 83, 141], dtype=np.int32)
+    gradient = np.broadcast_to(base_color + alpha // 4, (size, size, 3)).astype(np.uint8)
+    
+    image = Image.fromarray(gradient, 'RGB')
+    draw = ImageDraw.Draw(image)
+    
+    # Draw a rounded rectangle background
+    margin = 20
+    corner_radius = 30
+    
+    # Create rounded rectangle
+    rect_coords = [margin, margin, size - margin, size - margin]
+    draw.rounded_rectangle(rect_coords, corner_radius, fill='#4a9eff', outline='#ffffff', width=3)
+    
+    # Draw the two image icons and the conversion arrow
+    image = paint_symbols(image)
+    draw = ImageDraw.Draw(image)
+    center_y = size // 2
+    img_size = IMG_SIZE
     
     # Add text
     try:
@@ -88,24 +143,41 @@ def create_app_icon():
     
     # Save multiple sizes
     icon_sizes = [256, 128, 64, 48, 32, 16]
-    images = []
-    
-    for icon_size in icon_sizes:
-        resized = image.resize((icon_size, icon_size), Image.Resampling.LANCZOS)
-        images.append(resized)
-    
-    # Save as ICO file
-    ico_path = os.path.join(os.path.dirname(__file__), "app_icon.ico")
-    images[0].save(ico_path, format='ICO', sizes=[(s, s) for s in icon_sizes])
     
-    # Also save as PNG
-    png_path = os.path.join(os.path.dirname(__file__), "app_icon.png")
-    image.save(png_path, format='PNG')
+    def resize_icon(icon_size):
+        # LANCZOS only pays off for the large sizes; BOX is as good when shrinking 4x or more
+        if icon_size >= 128:
+            resample = Image.Resampling.LANCZOS
+        else:
+            resample = Image.Resampling.BOX
+        return image.resize((icon_size, icon_size), resample)
+    
+    # Pillow releases the GIL while resampling, so the sizes resize in parallel
+    with ThreadPoolExecutor(max_workers=min(len(icon_sizes), os.cpu_count() or 1)) as executor:
+        images = list(executor.map(resize_icon, icon_sizes))
+    
+    # Save as ICO file, writing the pre-resized rasters instead of letting Pillow resample again
+    images[0].save(
+        ico_path,
+        format='ICO',
+        sizes=[(s, s) for s in icon_sizes],
+        append_images=images[1:]
+    )
+    
+    # Also save as PNG if requested; the fastest zlib level suits this flat-colored image
+    if make_png:
+        image.save(png_path, format='PNG', compress_level=1)
+    
+    # Record which version of the drawing code produced these files
+    with open(stamp_path, 'w') as f:
+        f.write(ICON_STAMP)
     
     print(f"Icon created: {ico_path}")
-    print(f"Icon created: {png_path}")
+    if make_png:
+        print(f"Icon created: {png_path}")
     
     return ico_path
 
 if __name__ == "__main__":
-    create_app_icon()
\ No newline at end of file
+    import sys
+    create_app_icon(force="--force" in sys.argv, make_png="--png" in sys.argv)
\ No newline at end of file
@@ -8,16 +8,15 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import tkinterdnd2 as tkdnd
-from PIL import Image, ImageTk
 import threading
-import queue
 import os
 import sys
-from pathlib import Path
+import itertools
+import stat
 import logging
-from typing import List, Optional
-from image_converter import ImageConverter
-from utils import FileHandler, ProgressTracker
+from collections import OrderedDict, deque
+from utils import (FileHandler, ProgressTracker, get_conversion_pool, shutdown_conversion_pool,
+                   visible_row_range)
 
 # Configure logging
 logging.basicConfig(
@@ -29,7 +28,42 @@ logging.basicConfig(
     ]
 )
 
+# Extensions accepted by add_files, the same set FileHandler.is_image_file checks
+_IMG_EXTS = frozenset(FileHandler.IMAGE_EXTENSIONS)
+
+# File dialog filters; the first one lists every extension add_files accepts
+_FILETYPES = (
+    ("All supported images", " ".join(f"*{ext}" for ext in sorted(_IMG_EXTS))),
+    ("PNG files", "*.png"),
+    ("JPEG files", "*.jpg *.jpeg"),
+    ("WebP files", "*.webp"),
+    ("All files", "*.*")
+)
+
 class ImageConverterApp:
+    # Height of one file list row, including the 3 px gaps above and below it
+    ROW_HEIGHT = 78
+    
+    # Hidden file list rows kept for reuse instead of being destroyed
+    ROW_POOL_SIZE = 32
+    
+    # How often the Tk thread drains the conversion messages while a batch runs
+    CONVERSION_POLL_MS = 50
+    
+    # Pixels the file list moves per mouse wheel or scrollbar arrow step
+    SCROLL_STEP = 30
+    
+    # Drop area styles, built once and swapped in by the drag and hover handlers
+    _FRAME_IDLE = {"fg_color": ["gray92", "gray14"], "border_color": ["gray70", "gray30"]}
+    _FRAME_DRAG = {"fg_color": ["#4A9EFF", "#2E7AD1"], "border_color": ["#2E7AD1", "#4A9EFF"]}
+    _FRAME_DROP = {"fg_color": ["#27AE60", "#229954"], "border_color": ["#229954", "#27AE60"]}
+    _BORDER_IDLE = {"border_color": ["gray70", "gray30"]}
+    _BORDER_HOVER = {"border_color": ["#4A9EFF", "#2E7AD1"]}
+    _BROWSE_TEXT = "📁\n\nDrag & Drop Images Here\nor Click to Browse\n\nSupported: PNG, JPEG, WebP, TIFF, BMP, GIF"
+    _LABEL_IDLE = {"text": _BROWSE_TEXT, "text_color": ["gray50", "gray70"]}
+    _LABEL_DRAG = {"text": "🎯\n\nDrop Images Here!\n\nRelease to add files", "text_color": ["white", "white"]}
+    _LABEL_DROP = {"text": "✓\n\nFiles Added!\n\nProcessing...", "text_color": ["white", "white"]}
+    
     def __init__(self):
         # Initialize CustomTkinter
         ctk.set_appearance_mode("dark")  # "dark" or "light"
@@ -52,12 +86,14 @@ class ImageConverterApp:
         self.center_window()
         
         # Initialize components
-        self.image_converter = ImageConverter()
+        self._image_converter = None  # Created on first use, see image_converter
         self.file_handler = FileHandler()
         self.progress_tracker = ProgressTracker()
         
-        # Queue for thread communication
-        self.conversion_queue = queue.Queue()
+        # Messages from the conversion thread to the Tk thread. deque.append and
+        # popleft are atomic, so with one producer and one consumer no lock is needed.
+        # Only the Tk thread touches Tk: it polls the deque, see watch_conversion
+        self.conversion_queue = deque()
         
         # Variables
         self.output_format = ctk.StringVar(value="PNG")
@@ -68,14 +104,33 @@ class ImageConverterApp:
         self.quality_option = ctk.BooleanVar(value=False)
         self.quality_value = ctk.StringVar(value="95")
         
-        # File list for processing
+        # File list for processing, plus each file's info line keyed by path
+        # (also used for fast duplicate checks)
         self.file_list = []
+        self._file_info = {}
+        
+        # Row widgets of the files scrolled into view, and hidden rows kept for
+        # reuse (LRU order); files outside the viewport have no widgets
+        self._file_rows = {}
+        self._row_pool = OrderedDict()
+        self._rows_refresh_pending = False
+        self._file_list_top = 0  # Scroll offset into the file list, in pixels
         
         self.create_ui()
         self.setup_drag_drop()
         
-        # Start the UI update thread
-        self.root.after(100, self.check_conversion_queue)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        
+    @property
+    def image_converter(self):
+        """The conversion engine, imported on first use to keep Pillow/NumPy off the startup path"""
+        if self._image_converter is None:
+            from image_converter import ImageConverter, PILLOW_SIMD
+            if not PILLOW_SIMD:
+                logging.info("Pillow-SIMD not installed; for faster resizing and encoding run: "
+                             "pip uninstall -y Pillow && pip install -r requirements-simd.txt")
+            self._image_converter = ImageConverter()
+        return self._image_converter
         
     def create_ui(self):
         """Create the main user interface"""
@@ -170,7 +225,7 @@ class ImageConverterApp:
         # Drag and drop label with better styling
         self.drop_label = ctk.CTkLabel(
             inner_frame,
-            text="📁\n\nDrag & Drop Images Here\nor Click to Browse\n\nSupported: PNG, JPEG, WebP, TIFF, BMP, GIF",
+            text=self._BROWSE_TEXT,
             font=ctk.CTkFont(size=14, weight="bold"),
             text_color=["gray50", "gray70"],
             justify="center"
@@ -208,8 +263,8 @@ class ImageConverterApp:
         )
         self.file_count_label.grid(row=0, column=1, sticky="e")
         
-        # Scrollable frame for file list with better styling
-        self.file_list_frame = ctk.CTkScrollableFrame(
+        # Frame for file list with better styling
+        self.file_list_frame = ctk.CTkFrame(
             parent, 
             height=200,
             corner_radius=10,
@@ -217,6 +272,21 @@ class ImageConverterApp:
             border_color=["gray80", "gray20"]
         )
         self.file_list_frame.grid(row=2, column=0, sticky="nsew", padx=20, pady=(0, 20))
+        self.file_list_frame.grid_propagate(False)
+        self.file_list_frame.grid_columnconfigure(0, weight=1)
+        self.file_list_frame.grid_rowconfigure(0, weight=1)
+        
+        # Only the rows in view exist, placed on a body the size of the viewport.
+        # The list is never laid out at full height: X11 can't place windows
+        # more than 32767 px down, which a few hundred rows would pass
+        self._file_list_body = ctk.CTkFrame(self.file_list_frame, fg_color="transparent", height=1)
+        self._file_list_body.grid(row=0, column=0, sticky="nsew", padx=(10, 0), pady=6)
+        self._file_list_body.bind("<Configure>", lambda event: self._schedule_rows_refresh())
+        
+        # The scrollbar follows the row indices in view, see _refresh_visible_rows
+        self._file_list_scrollbar = ctk.CTkScrollbar(self.file_list_frame, command=self._scroll_file_list)
+        self._file_list_scrollbar.grid(row=0, column=1, sticky="ns", padx=(0, 4), pady=6)
+        self._bind_file_list_wheel(self._file_list_body)
         
     def create_settings_panel(self, parent):
         """Create the settings panel"""
@@ -378,81 +448,52 @@ class ImageConverterApp:
         
     def on_drag_enter(self, event):
         """Handle drag enter event"""
-        self.drop_frame.configure(
-            fg_color=["#4A9EFF", "#2E7AD1"],
-            border_color=["#2E7AD1", "#4A9EFF"]
-        )
-        self.drop_label.configure(
-            text="🎯\n\nDrop Images Here!\n\nRelease to add files",
-            text_color=["white", "white"]
-        )
+        self.drop_frame.configure(**self._FRAME_DRAG)
+        self.drop_label.configure(**self._LABEL_DRAG)
         
     def on_drag_leave(self, event):
         """Handle drag leave event"""
-        self.drop_frame.configure(
-            fg_color=["gray92", "gray14"],
-            border_color=["gray70", "gray30"]
-        )
-        self.drop_label.configure(
-            text="📁\n\nDrag & Drop Images Here\nor Click to Browse\n\nSupported: PNG, JPEG, WebP, TIFF, BMP, GIF",
-            text_color=["gray50", "gray70"]
-        )
+        self.drop_frame.configure(**self._FRAME_IDLE)
+        self.drop_label.configure(**self._LABEL_IDLE)
         
     def on_drop(self, event):
         """Handle file drop event"""
         # Add a brief success flash
-        self.drop_frame.configure(
-            fg_color=["#27AE60", "#229954"],
-            border_color=["#229954", "#27AE60"]
-        )
-        self.drop_label.configure(
-            text="✓\n\nFiles Added!\n\nProcessing...",
-            text_color=["white", "white"]
-        )
-        
-        # Process files
-        files = self.root.tk.splitlist(event.data)
-        self.add_files(files)
+        self.drop_frame.configure(**self._FRAME_DROP)
+        self.drop_label.configure(**self._LABEL_DROP)
+        
+        # Process files; a dropped folder adds the images directly inside it
+        files = []
+        folder_entries = []
+        for path in self.root.tk.splitlist(event.data):
+            # Only paths without an image extension can be folders worth scanning
+            if os.path.splitext(path)[1].lower() not in _IMG_EXTS and os.path.isdir(path):
+                folder_entries.extend(self.file_handler.stat_directory(path))
+            else:
+                files.append(path)
+        self.add_files(files, folder_entries)
         
         # Reset to normal after a short delay
         self.root.after(1000, self.reset_drop_area)
         
     def on_drop_hover(self, event):
         """Handle mouse hover over drop area"""
-        self.drop_frame.configure(
-            border_color=["#4A9EFF", "#2E7AD1"]
-        )
+        self.drop_frame.configure(**self._BORDER_HOVER)
         
     def on_drop_leave(self, event):
         """Handle mouse leave drop area"""
-        self.drop_frame.configure(
-            border_color=["gray70", "gray30"]
-        )
+        self.drop_frame.configure(**self._BORDER_IDLE)
         
     def reset_drop_area(self):
         """Reset drop area to normal state"""
-        self.drop_frame.configure(
-            fg_color=["gray92", "gray14"],
-            border_color=["gray70", "gray30"]
-        )
-        self.drop_label.configure(
-            text="📁\n\nDrag & Drop Images Here\nor Click to Browse\n\nSupported: PNG, JPEG, WebP, TIFF, BMP, GIF",
-            text_color=["gray50", "gray70"]
-        )
+        self.drop_frame.configure(**self._FRAME_IDLE)
+        self.drop_label.configure(**self._LABEL_IDLE)
         
     def browse_files(self, event=None):
         """Browse for files to convert"""
-        filetypes = [
-            ("All supported images", "*.png *.jpg *.jpeg *.gif *.bmp *.tiff *.webp *.avif"),
-            ("PNG files", "*.png"),
-            ("JPEG files", "*.jpg *.jpeg"),
-            ("WebP files", "*.webp"),
-            ("All files", "*.*")
-        ]
-        
         files = filedialog.askopenfilenames(
             title="Select images to convert",
-            filetypes=filetypes
+            filetypes=_FILETYPES
         )
         
         if files:
@@ -464,24 +505,34 @@ class ImageConverterApp:
         if folder:
             self.output_folder.set(folder)
             
-    def add_files(self, files):
-        """Add files to the conversion list"""
+    def add_files(self, files, entries=()):
+        """
+        Add files to the conversion list
+        
+        entries holds (path, stat) pairs that were already listed and filtered,
+        e.g. by FileHandler.stat_directory, so they are not looked up again.
+        """
         added_count = 0
         duplicate_count = 0
         invalid_count = 0
         
+        # Paths with other extensions can't be images; skip them without any I/O
+        candidates = []
         for file_path in files:
-            if os.path.isfile(file_path):
-                # Check if it's an image file
-                if self.file_handler.is_image_file(file_path):
-                    if file_path not in self.file_list:
-                        self.file_list.append(file_path)
-                        added_count += 1
-                        self.add_file_to_list_display(file_path)
-                    else:
-                        duplicate_count += 1
+            if os.path.splitext(file_path)[1].lower() in _IMG_EXTS:
+                candidates.append(file_path)
+            else:
+                invalid_count += 1
+                
+        for file_path, file_stat in itertools.chain(self.stat_files(candidates), entries):
+            # Extensions were already checked, so any regular file is an image to add
+            if file_stat is not None and stat.S_ISREG(file_stat.st_mode):
+                if file_path not in self._file_info:
+                    self.file_list.append(file_path)
+                    added_count += 1
+                    self.add_file_to_list_display(file_path, file_stat)
                 else:
-                    invalid_count += 1
+                    duplicate_count += 1
                     
         # Update file count and progress label
         self.update_file_count()
@@ -497,42 +548,164 @@ class ImageConverterApp:
         else:
             messagebox.showwarning("No Files", "No valid image files were selected.")
             
-    def add_file_to_list_display(self, file_path):
-        """Add a file entry to the display list"""
+    def stat_files(self, files):
+        """
+        Pair each path with its os.stat result (None if it can't be read)
+        
+        On Windows, files that all come from one folder, as from the file dialog,
+        are looked up in a single directory scan, which already carries their
+        size and type. Elsewhere DirEntry.stat() costs a syscall per file, the
+        same as os.stat, so scanning a large folder would only add work.
+        """
+        entries = {}
+        folders = {os.path.dirname(file_path) for file_path in files}
+        if os.name == 'nt' and len(files) > 1 and len(folders) == 1:
+            try:
+                with os.scandir(folders.pop() or ".") as scan:
+                    entries = {entry.name: entry for entry in scan}
+            except OSError:
+                pass
+                
+        results = []
+        for file_path in files:
+            try:
+                entry = entries.get(os.path.basename(file_path))
+                results.append((file_path, entry.stat() if entry else os.stat(file_path)))
+            except OSError:
+                results.append((file_path, None))
+        return results
+        
+    def add_file_to_list_display(self, file_path, file_stat=None):
+        """Add a file entry to the display list; its row is built once it scrolls into view"""
+        # File size and format info
+        try:
+            file_size = file_stat.st_size if file_stat else os.path.getsize(file_path)
+            size_text = self.format_file_size(file_size)
+            file_ext = os.path.splitext(file_path)[1].upper().replace('.', '')
+            info_text = f"{file_ext} • {size_text}"
+        except:
+            info_text = "Unknown size"
+        self._file_info[file_path] = info_text
+        self._schedule_rows_refresh()
+        
+    def _schedule_rows_refresh(self):
+        """Refresh the visible file list rows once the current batch of changes is done"""
+        if not self._rows_refresh_pending:
+            self._rows_refresh_pending = True
+            self.root.after_idle(self._refresh_visible_rows)
+            
+    def _file_list_viewport_height(self):
+        """Height of the file list viewport, in the same unscaled pixels as ROW_HEIGHT"""
+        body = self._file_list_body
+        return body.winfo_height() / ctk.ScalingTracker.get_widget_scaling(body)
+        
+    def _scroll_file_list(self, action, amount, unit=None):
+        """Scrollbar command: 'moveto' a fraction of the list or 'scroll' by units or pages"""
+        if action == "moveto":
+            self._file_list_top = float(amount) * len(self.file_list) * self.ROW_HEIGHT
+        elif unit == "pages":
+            self._file_list_top += int(amount) * self._file_list_viewport_height()
+        else:
+            self._file_list_top += int(amount) * self.SCROLL_STEP
+        self._schedule_rows_refresh()
+        
+    def _bind_file_list_wheel(self, widget):
+        """Scroll the file list with the mouse wheel over widget and every widget inside it"""
+        # Wheel events go to the widget under the pointer, so each one needs the binding
+        sequences = ("<Button-4>", "<Button-5>") if sys.platform.startswith("linux") else ("<MouseWheel>",)
+        for sequence in sequences:
+            tk.Misc.bind(widget, sequence, self._on_file_list_wheel, add="+")
+        for child in widget.winfo_children():
+            self._bind_file_list_wheel(child)
+            
+    def _on_file_list_wheel(self, event):
+        """Scroll the file list when the mouse wheel turns over it"""
+        if event.num in (4, 5):
+            steps = -1 if event.num == 4 else 1
+        elif sys.platform.startswith("win"):
+            steps = -event.delta / 120
+        else:
+            steps = -event.delta
+        self._file_list_top += steps * self.SCROLL_STEP
+        self._schedule_rows_refresh()
+        
+    def _refresh_visible_rows(self):
+        """Show rows for the files in the viewport and recycle the ones scrolled out of it"""
+        self._rows_refresh_pending = False
+        count = len(self.file_list)
+        viewport = self._file_list_viewport_height()
+        
+        # Keep the view inside the list, which can shrink under it on remove and clear
+        top = int(max(0, min(self._file_list_top, count * self.ROW_HEIGHT - viewport)))
+        self._file_list_top = top
+        first, last = visible_row_range(top, viewport, self.ROW_HEIGHT, count)
+        visible = self.file_list[first:last]
+        
+        for file_path in self._file_rows.keys() - set(visible):
+            self._recycle_file_row(file_path)
+        # Positions are relative to the viewport, so they stay small however long the list is
+        offset = top % self.ROW_HEIGHT
+        for index, file_path in enumerate(visible):
+            row = self._file_rows.get(file_path) or self._show_file_row(file_path)
+            row[0].place(x=0, y=index * self.ROW_HEIGHT - offset + 3, relwidth=1)
+            
+        if count:
+            self._file_list_scrollbar.set(first / count, last / count)
+        else:
+            self._file_list_scrollbar.set(0, 1)
+            
+    def _show_file_row(self, file_path):
+        """Get a row for file_path, reusing a recycled row when possible"""
+        # Prefer the row this file had before (its labels are already right),
+        # otherwise take the least recently used spare row
+        row = self._row_pool.pop(file_path, None)
+        reused_own_row = row is not None
+        if row is None and self._row_pool:
+            _, row = self._row_pool.popitem(last=False)
+        if row is None:
+            row = self._create_file_row()
+        file_frame, file_label, info_label, preview_btn, remove_btn = row
+        
+        if not reused_own_row:
+            # File name
+            file_label.configure(text=os.path.basename(file_path))
+            preview_btn.configure(command=lambda: self.preview_file(file_path))
+            remove_btn.configure(command=lambda: self.remove_file(file_path))
+            
+        # The info line can change if the file is removed and added again
+        info_label.configure(text=self._file_info[file_path])
+        self._file_rows[file_path] = row
+        return row
+        
+    def _create_file_row(self):
+        """Create the widgets for one file list row (filled in by _show_file_row)"""
+        # Fixed height, so each file's position follows from its index in the list
         file_frame = ctk.CTkFrame(
-            self.file_list_frame,
+            self._file_list_body,
+            height=self.ROW_HEIGHT - 6,
             corner_radius=8,
             border_width=1,
             border_color=["gray85", "gray25"]
         )
-        file_frame.pack(fill="x", pady=3, padx=5)
+        file_frame.pack_propagate(False)
         
         # File info frame
         info_frame = ctk.CTkFrame(file_frame, fg_color="transparent")
         info_frame.pack(side="left", fill="both", expand=True, padx=10, pady=8)
         
         # File name
-        filename = os.path.basename(file_path)
         file_label = ctk.CTkLabel(
             info_frame, 
-            text=filename, 
+            text="", 
             anchor="w",
             font=ctk.CTkFont(size=12, weight="bold")
         )
         file_label.pack(anchor="w")
         
         # File size and format info
-        try:
-            file_size = os.path.getsize(file_path)
-            size_text = self.format_file_size(file_size)
-            file_ext = os.path.splitext(file_path)[1].upper().replace('.', '')
-            info_text = f"{file_ext} • {size_text}"
-        except:
-            info_text = "Unknown size"
-            
         info_label = ctk.CTkLabel(
             info_frame,
-            text=info_text,
+            text="",
             anchor="w",
             font=ctk.CTkFont(size=10),
             text_color="gray60"
@@ -549,7 +722,6 @@ class ImageConverterApp:
             text="🔍",
             width=30,
             height=25,
-            command=lambda: self.preview_file(file_path),
             fg_color="transparent",
             text_color=["gray60", "gray40"],
             hover_color=["gray80", "gray20"]
@@ -562,18 +734,37 @@ class ImageConverterApp:
             text="❌",
             width=30,
             height=25,
-            command=lambda: self.remove_file(file_path, file_frame),
             fg_color="transparent",
             text_color=["#E74C3C", "#C0392B"],
             hover_color=["#FFE5E5", "#4A1A1A"]
         )
         remove_btn.pack(side="right")
         
-    def remove_file(self, file_path, frame):
+        # Rows are reused, so binding them once when they are built is enough
+        self._bind_file_list_wheel(file_frame)
+        
+        return file_frame, file_label, info_label, preview_btn, remove_btn
+        
+    def _recycle_file_row(self, file_path):
+        """Take a file's row off the list and keep it for reuse"""
+        row = self._file_rows.pop(file_path, None)
+        if row is None:
+            return
+        row[0].place_forget()
+        self._row_pool[file_path] = row
+        
+        # Bound the number of hidden rows kept alive
+        if len(self._row_pool) > self.ROW_POOL_SIZE:
+            _, oldest = self._row_pool.popitem(last=False)
+            oldest[0].destroy()
+            
+    def remove_file(self, file_path):
         """Remove a file from the list"""
-        if file_path in self.file_list:
+        if file_path in self._file_info:
+            del self._file_info[file_path]
             self.file_list.remove(file_path)
-            frame.destroy()
+            self._recycle_file_row(file_path)
+            self._schedule_rows_refresh()
             self.update_file_count()
             if len(self.file_list) > 0:
                 self.progress_label.configure(text=f"{len(self.file_list)} files ready for conversion")
@@ -594,9 +785,11 @@ class ImageConverterApp:
         )
         
         if result:
+            for file_path in list(self._file_rows):
+                self._recycle_file_row(file_path)
             self.file_list.clear()
-            for widget in self.file_list_frame.winfo_children():
-                widget.destroy()
+            self._file_info.clear()
+            self._schedule_rows_refresh()
             self.update_file_count()
             self.progress_label.configure(text="Ready to convert images")
             self.progress_bar.set(0)
@@ -616,11 +809,9 @@ class ImageConverterApp:
         if size_bytes == 0:
             return "0 B"
         size_names = ["B", "KB", "MB", "GB"]
-        i = 0
-        size = float(size_bytes)
-        while size >= 1024.0 and i < len(size_names) - 1:
-            size /= 1024.0
-            i += 1
+        # Each unit is 2**10 larger, so the bit length picks the unit directly
+        i = min((size_bytes.bit_length() - 1) // 10, len(size_names) - 1)
+        size = size_bytes / (1 << (10 * i))
         return f"{size:.1f} {size_names[i]}"
         
     def preview_file(self, file_path):
@@ -672,103 +863,146 @@ class ImageConverterApp:
         # Disable convert button during conversion
         self.convert_btn.configure(state="disabled", text="Converting...")
         
+        # Read the settings and file list here, on the Tk thread, once for the whole batch
+        settings = self.get_conversion_settings()
+        
         # Start conversion in a separate thread
-        conversion_thread = threading.Thread(target=self.convert_images, daemon=True)
+        conversion_thread = threading.Thread(
+            target=self.convert_images,
+            args=(list(self.file_list), settings),
+            daemon=True
+        )
         conversion_thread.start()
+        self.root.after(self.CONVERSION_POLL_MS, self.watch_conversion, conversion_thread)
         
-    def convert_images(self):
+    def get_conversion_settings(self):
+        """Read the conversion settings from the UI, with validation"""
+        resize_dimensions = None
+        if self.resize_option.get():
+            try:
+                width = int(self.resize_width.get()) if self.resize_width.get().strip() else 1920
+                height = int(self.resize_height.get()) if self.resize_height.get().strip() else 1080
+                resize_dimensions = (width, height)
+            except ValueError:
+                resize_dimensions = (1920, 1080)  # Default values
+                
+        quality_value = None
+        if self.quality_option.get():
+            try:
+                quality_value = int(self.quality_value.get()) if self.quality_value.get().strip() else 95
+                quality_value = max(1, min(100, quality_value))  # Clamp between 1-100
+            except ValueError:
+                quality_value = 95  # Default value
+        
+        return {
+            'output_format': self.output_format.get().lower(),
+            'output_folder': self.output_folder.get() if self.output_folder.get() != "Same as input" else None,
+            'resize': self.resize_option.get(),
+            'resize_dimensions': resize_dimensions,
+            'quality': quality_value
+        }
+        
+    def convert_images(self, file_list, settings):
         """Convert images in a separate thread"""
         try:
-            total_files = len(self.file_list)
-            successful_conversions = 0
+            total_files = len(file_list)
+            file_names = [os.path.basename(file_path) for file_path in file_list]
             failed_conversions = []
+            tracker = self.progress_tracker
+            tracker.reset()
+            tracker.set_total_files(total_files)
+            tracker.start_processing()
             
-            for i, file_path in enumerate(self.file_list):
-                # Update progress
-                progress = i / total_files
-                self.conversion_queue.put(("progress", progress, f"Converting {os.path.basename(file_path)}..."))
-                
-                try:
-                    # Get conversion settings with validation
-                    resize_dimensions = None
-                    if self.resize_option.get():
-                        try:
-                            width = int(self.resize_width.get()) if self.resize_width.get().strip() else 1920
-                            height = int(self.resize_height.get()) if self.resize_height.get().strip() else 1080
-                            resize_dimensions = (width, height)
-                        except ValueError:
-                            resize_dimensions = (1920, 1080)  # Default values
-                            
-                    quality_value = None
-                    if self.quality_option.get():
-                        try:
-                            quality_value = int(self.quality_value.get()) if self.quality_value.get().strip() else 95
-                            quality_value = max(1, min(100, quality_value))  # Clamp between 1-100
-                        except ValueError:
-                            quality_value = 95  # Default value
-                    
-                    settings = {
-                        'output_format': self.output_format.get().lower(),
-                        'output_folder': self.output_folder.get() if self.output_folder.get() != "Same as input" else None,
-                        'resize': self.resize_option.get(),
-                        'resize_dimensions': resize_dimensions,
-                        'quality': quality_value
-                    }
-                    
-                    # Convert the image
-                    success = self.image_converter.convert_image(file_path, settings)
-                    
-                    if success:
-                        successful_conversions += 1
-                    else:
-                        failed_conversions.append(os.path.basename(file_path))
-                        
-                except Exception as e:
-                    logging.error(f"Error converting {file_path}: {str(e)}")
-                    failed_conversions.append(os.path.basename(file_path))
+            self.post_conversion_message("progress", 0.0, f"Converting {total_files} files...")
+            
+            def on_file_done(index, success):
+                file_name = file_names[index]
+                tracker.mark_file_processed(success)
+                if not success:
+                    failed_conversions.append(file_name)
                     
+                # Large batches of small files finish faster than anyone can read,
+                # so progress is only sent at the tracker's bounded rate
+                if tracker.should_emit():
+                    completed = tracker.processed_files
+                    self.post_conversion_message("progress", completed / total_files, f"Converted {file_name} ({completed}/{total_files})")
+                
+            # Convert the images in parallel on the shared conversion thread pool; the
+            # workers share this process, so no pixel data is copied between processes
+            self.image_converter.convert_many(
+                file_list,
+                settings,
+                progress_callback=on_file_done,
+                executor=get_conversion_pool()
+            )
+            
+            tracker.finish_processing()
+            successful_conversions = tracker.successful_conversions
+            
             # Final progress update
-            self.conversion_queue.put(("progress", 1.0, f"Conversion complete: {successful_conversions}/{total_files} successful"))
-            self.conversion_queue.put(("complete", successful_conversions, failed_conversions))
+            self.post_conversion_message("progress", 1.0, f"Conversion complete: {successful_conversions}/{total_files} successful")
+            # Join the failure list here rather than on the Tk thread
+            failed_list = "\n".join(failed_conversions)
+            self.post_conversion_message("complete", successful_conversions, len(failed_conversions), failed_list)
             
         except Exception as e:
             logging.error(f"Conversion thread error: {str(e)}")
-            self.conversion_queue.put(("error", str(e)))
+            self.post_conversion_message("error", str(e))
+            
+    def post_conversion_message(self, *message):
+        """Queue a message for the Tk thread (called from the conversion thread)"""
+        self.conversion_queue.append(message)
+        
+    def watch_conversion(self, conversion_thread):
+        """Drain the conversion messages every CONVERSION_POLL_MS while a conversion is running"""
+        # Check the thread first, so the messages it queued before finishing are drained
+        running = conversion_thread.is_alive()
+        if self.conversion_queue:
+            self.check_conversion_queue()
+        if running:
+            self.root.after(self.CONVERSION_POLL_MS, self.watch_conversion, conversion_thread)
             
     def check_conversion_queue(self):
-        """Check for updates from the conversion thread"""
-        try:
-            while True:
-                message_type, *data = self.conversion_queue.get_nowait()
+        """Handle the updates queued by the conversion thread"""
+        # Drain everything queued so far, but redraw the progress widgets only
+        # once, with the latest values
+        last_progress = None
+        while self.conversion_queue:
+            message_type, *data = self.conversion_queue.popleft()
+            
+            if message_type == "progress":
+                last_progress = data
+                continue
                 
-                if message_type == "progress":
-                    progress, status_text = data
-                    self.progress_bar.set(progress)
-                    self.progress_label.configure(text=status_text)
-                    
-                elif message_type == "complete":
-                    successful, failed = data
-                    self.convert_btn.configure(state="normal", text="Start Conversion")
-                    
-                    if failed:
-                        failed_list = "\n".join(failed)
-                        messagebox.showwarning(
-                            "Conversion Complete with Errors",
-                            f"Successfully converted: {successful}\nFailed: {len(failed)}\n\nFailed files:\n{failed_list}"
-                        )
-                    else:
-                        messagebox.showinfo("Conversion Complete", f"Successfully converted all {successful} images!")
-                        
-                elif message_type == "error":
-                    error_msg = data[0]
-                    self.convert_btn.configure(state="normal", text="Start Conversion")
-                    messagebox.showerror("Conversion Error", f"An error occurred during conversion:\n{error_msg}")
+            # Show the final progress before any completion dialog
+            if last_progress is not None:
+                self.update_progress(*last_progress)
+                last_progress = None
+                
+            if message_type == "complete":
+                successful, failed_count, failed_list = data
+                self.convert_btn.configure(state="normal", text="Start Conversion")
+                
+                if failed_count:
+                    messagebox.showwarning(
+                        "Conversion Complete with Errors",
+                        f"Successfully converted: {successful}\nFailed: {failed_count}\n\nFailed files:\n{failed_list}"
+                    )
+                else:
+                    messagebox.showinfo("Conversion Complete", f"Successfully converted all {successful} images!")
                     
-        except queue.Empty:
-            pass
-            
-        # Schedule next check
-        self.root.after(100, self.check_conversion_queue)
+            elif message_type == "error":
+                error_msg = data[0]
+                self.convert_btn.configure(state="normal", text="Start Conversion")
+                messagebox.showerror("Conversion Error", f"An error occurred during conversion:\n{error_msg}")
+                
+        if last_progress is not None:
+            self.update_progress(*last_progress)
+        
+    def update_progress(self, progress, status_text):
+        """Show a progress value and status text"""
+        self.progress_bar.set(progress)
+        self.progress_label.configure(text=status_text)
         
     def center_window(self):
         """Center the window on the screen"""
@@ -779,6 +1013,11 @@ class ImageConverterApp:
         y = (self.root.winfo_screenheight() // 2) - (height // 2)
         self.root.geometry(f"{width}x{height}+{x}+{y}")
         
+    def on_closing(self):
+        """Drop queued conversions so closing the window does not wait for them"""
+        shutdown_conversion_pool()
+        self.root.destroy()
+        
     def run(self):
         """Start the application"""
         self.root.mainloop()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for the conversion history in advanced_features.
+"""
+
+import datetime
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_features import ConversionHistory
+
+
+class ConversionEntryTest(unittest.TestCase):
+
+    def setUp(self):
+        history = ConversionHistory()
+        history.add_conversion(os.path.join("photos", "a.jpg"), os.path.join("out", "a.png"),
+                               True, 0.5, 2000, 1000)
+        self.entry = history.history[0]
+
+    def test_item_access_with_the_dict_keys(self):
+        self.assertEqual(self.entry['source_path'], os.path.join("photos", "a.jpg"))
+        self.assertEqual(self.entry['target_filename'], "a.png")
+        self.assertEqual(self.entry['compression_ratio'], 0.5)
+        self.assertIsInstance(self.entry['timestamp'], datetime.datetime)
+
+    def test_dict_conversion(self):
+        entry = dict(self.entry)
+        self.assertEqual(set(entry), {
+            'timestamp', 'source_path', 'target_path', 'source_filename', 'target_filename',
+            'success', 'conversion_time', 'file_size_before', 'file_size_after', 'compression_ratio'})
+        self.assertIs(entry['success'], True)
+
+    def test_unknown_key(self):
+        with self.assertRaises(KeyError):
+            self.entry['source_dir']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the icon drawing in create_icon.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from create_icon import IMG_SIZE, paint_symbols
+
+
+def draw_symbols_with_imagedraw(image):
+    """The ImageDraw calls paint_symbols replaced, as they were drawn before"""
+    image = image.copy()
+    draw = ImageDraw.Draw(image)
+    arrow_color = '#ffffff'
+    center_x, center_y = image.width // 2, image.height // 2
+
+    img_size = IMG_SIZE
+    img_x1 = center_x - img_size - 10
+    img_y1 = center_y - img_size // 2
+    img_x2 = img_x1 + img_size
+    img_y2 = img_y1 + img_size
+    draw.rectangle([img_x1, img_y1, img_x2, img_y2], fill=arrow_color, outline='#cccccc', width=2)
+    draw.polygon([img_x2-12, img_y1, img_x2, img_y1, img_x2, img_y1+12], fill='#cccccc')
+
+    arrow_width = 30
+    arrow_y = center_y
+    arrow_start_x = img_x2 + 8
+    arrow_end_x = arrow_start_x + arrow_width
+    draw.line([(arrow_start_x, arrow_y), (arrow_end_x - 8, arrow_y)], fill=arrow_color, width=4)
+    draw.polygon([
+        (arrow_end_x - 8, arrow_y - 8),
+        (arrow_end_x, arrow_y),
+        (arrow_end_x - 8, arrow_y + 8)
+    ], fill=arrow_color)
+
+    img_x3 = arrow_end_x + 8
+    img_x4 = img_x3 + img_size
+    draw.rectangle([img_x3, img_y1, img_x4, img_y2], fill=arrow_color, outline='#cccccc', width=2)
+    draw.polygon([img_x4-12, img_y1, img_x4, img_y1, img_x4, img_y1+12], fill='#cccccc')
+    return image
+
+
+class PaintSymbolsTest(unittest.TestCase):
+
+    def test_matches_imagedraw(self):
+        background = Image.new('RGB', (256, 256), '#4a9eff')
+        expected = np.asarray(draw_symbols_with_imagedraw(background))
+        actual = np.asarray(paint_symbols(background))
+        self.assertTrue(np.array_equal(actual, expected),
+                        f"{np.count_nonzero((actual != expected).any(axis=2))} pixels differ")
+
+
+if __name__ == '__main__':
+    unittest.main()
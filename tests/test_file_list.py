@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for the virtual file list bookkeeping in the GUI.
+"""
+
+import os
+import sys
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main_nodnd import ImageConverterApp
+
+
+class VirtualFileListTest(unittest.TestCase):
+
+    VIEWPORT = 200  # Shows rows 0-2 at the top of the list
+
+    def setUp(self):
+        # Skip __init__: no Tk window, only the state the list methods use
+        app = ImageConverterApp.__new__(ImageConverterApp)
+        app.root = mock.Mock()
+        app.root.after_idle.side_effect = lambda callback: callback()
+        app.file_list = []
+        app._file_info = {}
+        app._file_rows = {}
+        app._row_pool = OrderedDict()
+        app._rows_refresh_pending = False
+        app._file_list_top = 0
+        app._file_list_scrollbar = mock.Mock()
+        app._file_list_viewport_height = lambda: self.VIEWPORT
+        app._create_file_row = mock.Mock(
+            side_effect=lambda: tuple(mock.Mock() for _ in range(5)))
+        app.file_count_label = mock.Mock()
+        app.progress_label = mock.Mock()
+        app.progress_bar = mock.Mock()
+        self.app = app
+
+    def add(self, count):
+        for index in range(count):
+            file_path = f"/images/{index:05}.png"
+            self.app.file_list.append(file_path)
+            self.app.add_file_to_list_display(file_path, os.stat_result((0,) * 10))
+
+    def placed_rows(self):
+        """(file path, y) of the shown rows, in list order"""
+        rows = []
+        for file_path, row in self.app._file_rows.items():
+            rows.append((file_path, row[0].place.call_args.kwargs["y"]))
+        return sorted(rows)
+
+    def test_builds_rows_only_for_the_viewport(self):
+        self.add(10000)
+        self.assertEqual(self.app._create_file_row.call_count, 3)
+        self.assertEqual(self.placed_rows(), [
+            ("/images/00000.png", 3), ("/images/00001.png", 81), ("/images/00002.png", 159)])
+        self.app._file_list_scrollbar.set.assert_called_with(0, 3 / 10000)
+
+    def test_rows_at_the_bottom_stay_inside_the_viewport(self):
+        self.add(10000)
+        self.app._scroll_file_list("moveto", 1.0)
+        placed = self.placed_rows()
+        self.assertEqual([file_path for file_path, y in placed],
+                         ["/images/09997.png", "/images/09998.png", "/images/09999.png"])
+        self.assertTrue(all(-self.app.ROW_HEIGHT < y < self.VIEWPORT for file_path, y in placed))
+        self.app._file_list_scrollbar.set.assert_called_with(9997 / 10000, 1.0)
+
+    def test_scrolling_reuses_rows(self):
+        self.add(1000)
+        for _ in range(200):
+            self.app._scroll_file_list("scroll", 1, "units")
+        self.assertEqual(self.app._file_list_top, 200 * self.app.SCROLL_STEP)
+        self.assertLessEqual(self.app._create_file_row.call_count, 4)
+
+    def test_mouse_wheel_scrolls_and_stops_at_the_top(self):
+        self.add(100)
+        self.app._on_file_list_wheel(mock.Mock(num=5, delta=0))
+        self.app._on_file_list_wheel(mock.Mock(num=5, delta=0))
+        self.assertEqual(self.app._file_list_top, 2 * self.app.SCROLL_STEP)
+        for _ in range(3):
+            self.app._on_file_list_wheel(mock.Mock(num=4, delta=0))
+        self.assertEqual(self.app._file_list_top, 0)
+
+    def test_remove_recycles_the_row_and_fills_the_gap(self):
+        self.add(5)
+        row = self.app._file_rows["/images/00001.png"]
+        self.app.remove_file("/images/00001.png")
+        self.assertEqual(self.app._create_file_row.call_count, 3)
+        self.assertIs(self.app._file_rows["/images/00003.png"], row)
+        self.assertEqual([file_path for file_path, y in self.placed_rows()],
+                         ["/images/00000.png", "/images/00002.png", "/images/00003.png"])
+
+    def test_remove_at_the_bottom_pulls_the_view_back(self):
+        self.add(10)
+        self.app._scroll_file_list("moveto", 1.0)
+        self.app.remove_file("/images/00009.png")
+        self.assertEqual(self.app._file_list_top, 9 * self.app.ROW_HEIGHT - self.VIEWPORT)
+        self.assertEqual([file_path for file_path, y in self.placed_rows()],
+                         ["/images/00006.png", "/images/00007.png", "/images/00008.png"])
+
+    def test_clear_recycles_every_row(self):
+        self.add(10)
+        with mock.patch("main_nodnd.messagebox.askyesno", return_value=True):
+            self.app.clear_files()
+        self.assertEqual(self.app._file_rows, {})
+        self.assertEqual(len(self.app._row_pool), 3)
+        self.assertEqual(self.app._file_list_top, 0)
+        self.app._file_list_scrollbar.set.assert_called_with(0, 1)
+
+    def test_re_adding_a_removed_file_gets_its_row_back(self):
+        self.add(3)
+        row = self.app._file_rows["/images/00001.png"]
+        self.app.remove_file("/images/00001.png")
+        self.app.file_list.append("/images/00001.png")
+        self.app.add_file_to_list_display("/images/00001.png", os.stat_result((0,) * 6 + (2048,) + (0,) * 3))
+        self.assertIs(self.app._file_rows["/images/00001.png"], row)
+        row[2].configure.assert_called_with(text="PNG • 2.0 KB")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for ImageConverter's input opening, batch and encode paths.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import image_converter
+from image_converter import ImageConverter
+
+
+class _EncodeOnlyJPEGEncoder:
+    """Stands in for PyTurboJPEG 1.x: records encode calls and encodes with Pillow"""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, img_array, quality=85, pixel_format=None, jpeg_subsample=None, flags=0):
+        import io
+        self.calls.append(('encode', jpeg_subsample))
+        buf = io.BytesIO()
+        Image.fromarray(img_array).save(buf, 'JPEG', quality=quality)
+        return buf.getvalue()
+
+
+class _RecordingJPEGEncoder(_EncodeOnlyJPEGEncoder):
+    """Stands in for PyTurboJPEG 2, which adds a lossless optimize() pass"""
+
+    def optimize(self, jpeg_buf):
+        self.calls.append(('optimize',))
+        return jpeg_buf
+
+
+class TurboJPEGEncodeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.input_path = os.path.join(self.tmp_dir.name, "in.jpg")
+        Image.new('RGB', (32, 24), (200, 100, 50)).save(self.input_path, 'JPEG')
+        self.output_path = os.path.join(self.tmp_dir.name, "out.jpg")
+
+        patches = [
+            mock.patch.object(image_converter, 'TJPF_RGB', 0, create=True),
+            mock.patch.object(image_converter, 'TJFLAG_PROGRESSIVE', 16384, create=True),
+            mock.patch.object(image_converter, '_TURBO_SUBSAMPLING',
+                              {0: 100, 1: 101, 2: 102, '4:4:4': 100, '4:2:2': 101, '4:2:0': 102},
+                              create=True),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _save(self, encoder, **settings):
+        with mock.patch.object(image_converter, '_turbo_jpeg', encoder):
+            with Image.open(self.input_path) as img:
+                return ImageConverter()._save_image(img, self.output_path, 'jpg', None, True,
+                                                    settings=settings)
+
+    def test_string_subsampling_uses_turbo(self):
+        encoder = _RecordingJPEGEncoder()
+        self.assertTrue(self._save(encoder, subsampling='4:2:0'))
+        self.assertEqual(encoder.calls, [('encode', 102), ('optimize',)])
+
+    def test_keep_subsampling_falls_back_to_pillow(self):
+        encoder = _RecordingJPEGEncoder()
+        self.assertTrue(self._save(encoder, subsampling='keep'))
+        self.assertEqual(encoder.calls, [])
+        with Image.open(self.output_path) as img:
+            self.assertEqual(img.format, 'JPEG')
+
+    def test_progressive_skips_the_optimize_pass(self):
+        encoder = _RecordingJPEGEncoder()
+        self.assertTrue(self._save(encoder, progressive=True))
+        self.assertEqual(encoder.calls, [('encode', 102)])
+
+    def test_encoder_without_optimize_still_uses_turbo(self):
+        encoder = _EncodeOnlyJPEGEncoder()
+        self.assertTrue(self._save(encoder))
+        self.assertEqual(encoder.calls, [('encode', 102)])
+        with Image.open(self.output_path) as img:
+            self.assertEqual(img.format, 'JPEG')
+
+
+class OutputNameTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.input_path = os.path.join(self.tmp_dir.name, "photo.png")
+        self.settings = {'output_format': 'jpg', 'output_folder': os.path.join(self.tmp_dir.name, 'out')}
+
+    def test_failed_conversion_frees_its_output_name(self):
+        converter = ImageConverter()
+        with open(self.input_path, 'wb') as f:
+            f.write(b"not an image")
+        self.assertFalse(converter.convert_image(self.input_path, self.settings))
+
+        Image.new('RGB', (8, 8)).save(self.input_path)
+        self.assertTrue(converter.convert_image(self.input_path, self.settings))
+        self.assertEqual(os.listdir(self.settings['output_folder']), ["photo.jpg"])
+
+
+class ConvertManyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_same_stem_inputs_get_distinct_outputs(self):
+        input_paths = []
+        for suffix in ('png', 'bmp', 'gif', 'tiff', 'jpg', 'webp'):
+            path = os.path.join(self.tmp_dir.name, f"photo.{suffix}")
+            Image.new('RGB', (16, 16), (30, 60, 90)).save(path)
+            input_paths.append(path)
+        settings = {'output_format': 'png', 'output_folder': os.path.join(self.tmp_dir.name, 'out')}
+
+        results = ImageConverter().convert_many(input_paths, settings, max_workers=4)
+        self.assertEqual(results, [True] * len(input_paths))
+        self.assertEqual(len(os.listdir(settings['output_folder'])), len(input_paths))
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "worker processes need the fork start method")
+    def test_convert_many_in_processes(self):
+        input_paths = []
+        for index in range(4):
+            path = os.path.join(self.tmp_dir.name, f"in{index}.jpg")
+            Image.new('RGB', (64, 48), (index * 60, 120, 200)).save(path, 'JPEG')
+            input_paths.append(path)
+        settings = {'output_format': 'png', 'output_folder': os.path.join(self.tmp_dir.name, 'out')}
+
+        results = ImageConverter().convert_many(input_paths, settings, max_workers=2, use_processes=True)
+        self.assertEqual(results, [True] * len(input_paths))
+        self.assertEqual(len(os.listdir(settings['output_folder'])), len(input_paths))
+
+    def test_unusable_output_folder_fails_every_file(self):
+        input_paths = []
+        for index in range(3):
+            path = os.path.join(self.tmp_dir.name, f"in{index}.png")
+            Image.new('RGB', (8, 8)).save(path)
+            input_paths.append(path)
+        # A regular file in the way makes os.makedirs fail
+        blocker = os.path.join(self.tmp_dir.name, 'blocker')
+        open(blocker, 'w').close()
+        settings = {'output_format': 'jpg', 'output_folder': os.path.join(blocker, 'out')}
+
+        reported = []
+        results = ImageConverter().convert_many(input_paths, settings,
+                                                progress_callback=lambda *args: reported.append(args))
+        self.assertEqual(results, [False] * len(input_paths))
+        self.assertEqual(reported, [(index, False) for index in range(len(input_paths))])
+
+
+class OpenBySuffixTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_unregistered_plugin_falls_back_to_detection(self):
+        # Stock Pillow has no AVIF plugin, so formats=('AVIF',) raises KeyError
+        path = os.path.join(self.tmp_dir.name, "misnamed.avif")
+        Image.new('RGB', (8, 8)).save(path, 'PNG')
+        with mock.patch.dict(Image.OPEN):
+            Image.OPEN.pop('AVIF', None)
+            with ImageConverter._open_by_suffix(path) as img:
+                self.assertEqual(img.format, 'PNG')
+
+
+class CopySameFormatTest(unittest.TestCase):
+
+    def test_tif_input_is_copied_unchanged(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_path = os.path.join(tmp_dir, "scan.tif")
+            Image.new('RGB', (16, 16), (10, 20, 30)).save(input_path, 'TIFF')
+            settings = {'output_format': 'tiff', 'output_folder': os.path.join(tmp_dir, 'out')}
+            self.assertTrue(ImageConverter().convert_image(input_path, settings))
+
+            output_path = os.path.join(settings['output_folder'], os.listdir(settings['output_folder'])[0])
+            with open(input_path, 'rb') as src, open(output_path, 'rb') as dst:
+                self.assertEqual(src.read(), dst.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
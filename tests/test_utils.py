@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the helper functions in utils.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import FileHandler, validate_image_dimensions, visible_row_range
+
+
+class ValidateImageDimensionsTest(unittest.TestCase):
+
+    def test_accepts_the_full_range(self):
+        for width, height in ((1, 1), (1, 65535), (65535, 1), (65535, 65535), (800, 600)):
+            self.assertIs(validate_image_dimensions(width, height), True)
+
+    def test_rejects_zero(self):
+        self.assertFalse(validate_image_dimensions(0, 600))
+        self.assertFalse(validate_image_dimensions(800, 0))
+
+    def test_rejects_negative_values(self):
+        self.assertFalse(validate_image_dimensions(-1, 600))
+        self.assertFalse(validate_image_dimensions(800, -65536))
+
+    def test_rejects_values_over_the_limit(self):
+        self.assertFalse(validate_image_dimensions(65536, 600))
+        self.assertFalse(validate_image_dimensions(800, 1 << 32))
+
+    def test_accepts_whole_number_floats(self):
+        self.assertTrue(validate_image_dimensions(800.0, 600))
+
+
+class VisibleRowRangeTest(unittest.TestCase):
+
+    def test_top_of_the_list(self):
+        self.assertEqual(visible_row_range(0, 200, 78, 10000), (0, 3))
+
+    def test_partly_scrolled_rows_count_as_visible(self):
+        self.assertEqual(visible_row_range(100, 200, 78, 10000), (1, 4))
+
+    def test_viewport_ending_on_a_row_boundary(self):
+        self.assertEqual(visible_row_range(78, 156, 78, 10000), (1, 3))
+
+    def test_bottom_of_a_long_list(self):
+        self.assertEqual(visible_row_range(10000 * 78 - 200, 200, 78, 10000), (9997, 10000))
+
+    def test_short_list_stops_at_its_end(self):
+        self.assertEqual(visible_row_range(0, 200, 78, 2), (0, 2))
+
+    def test_empty_list(self):
+        self.assertEqual(visible_row_range(0, 200, 78, 0), (0, 0))
+
+    def test_offset_past_the_end_gives_an_empty_range(self):
+        self.assertEqual(visible_row_range(5000, 200, 78, 3), (3, 3))
+
+    def test_unmapped_viewport(self):
+        self.assertEqual(visible_row_range(0, 1, 78, 10), (0, 1))
+
+
+class StatDirectoryTest(unittest.TestCase):
+
+    def test_skips_entries_that_fail_to_stat(self):
+        with tempfile.TemporaryDirectory() as folder:
+            for name in ("a.png", "b.png", "c.png"):
+                open(os.path.join(folder, name), 'wb').close()
+
+            real_scan = FileHandler._scan_image_entries
+            def scan_with_a_deleted_file(handler, path):
+                for entry in real_scan(handler, path):
+                    if entry.name == "b.png":
+                        entry = mock.Mock(path=entry.path, stat=mock.Mock(side_effect=FileNotFoundError))
+                    yield entry
+
+            with mock.patch.object(FileHandler, '_scan_image_entries', scan_with_a_deleted_file):
+                entries = FileHandler().stat_directory(folder)
+
+        self.assertEqual([os.path.basename(path) for path, file_stat in entries], ["a.png", "c.png"])
+
+
+if __name__ == '__main__':
+    unittest.main()
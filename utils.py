@@ -4,28 +4,132 @@ Utility classes and functions for the Image Converter application.
 """
 
 import os
-import mimetypes
+import json
+import time
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 import logging
 
+# Shared by the FileHandler, ProgressTracker and ConfigManager instances
+_logger = logging.getLogger(__name__)
+
+if os.name == 'nt':
+    import ctypes
+    from ctypes import wintypes
+    
+    # Declare the signature once so calls skip ctypes' argument type guessing
+    _GetDiskFreeSpaceExW = ctypes.WinDLL('kernel32', use_last_error=True).GetDiskFreeSpaceExW
+    _GetDiskFreeSpaceExW.argtypes = (wintypes.LPCWSTR, ctypes.POINTER(ctypes.c_ulonglong),
+                                     ctypes.POINTER(ctypes.c_ulonglong), ctypes.POINTER(ctypes.c_ulonglong))
+    _GetDiskFreeSpaceExW.restype = wintypes.BOOL
+    
+    def _check_win32_result(result, func, args):
+        """ctypes errcheck: raise the thread's last Win32 error when a call fails"""
+        if not result:
+            raise ctypes.WinError(ctypes.get_last_error())
+        return args
+        
+    _GetDiskFreeSpaceExW.errcheck = _check_win32_result
+
+# Optional orjson backend for reading and writing the config file; both
+# variants work on UTF-8 bytes
+try:
+    import orjson
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+        
+    _json_loads = json.loads
+
+# Image file extensions (lowercase, with the leading dot)
+IMAGE_EXTENSIONS = frozenset({
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif',
+    '.webp', '.avif', '.ico', '.ppm', '.pgm', '.pbm'
+})
+
+
+# IMAGE_EXTENSIONS plus the usual '.JPG' and '.Jpg' spellings, matched without lower()
+_EXTENSION_SPELLINGS = frozenset(
+    spelling
+    for ext in IMAGE_EXTENSIONS
+    for spelling in (ext, ext.upper(), '.' + ext[1:].capitalize())
+)
+
+
+def _has_image_extension(file_path: str) -> bool:
+    """Check the extension of a path or file name against IMAGE_EXTENSIONS"""
+    dot = file_path.rfind('.')
+    if dot < 0:
+        return False
+    ext = file_path[dot:]
+    # Only unusual mixed-case spellings need the lowercase copy
+    return ext in _EXTENSION_SPELLINGS or ext.lower() in IMAGE_EXTENSIONS
+
+
+# Number of paths each filter_image_files task checks
+_FILTER_CHUNK_SIZE = 256
+
+
+@functools.lru_cache(maxsize=None)
+def _io_pool() -> ThreadPoolExecutor:
+    """Thread pool for blocking file system calls, created on first use"""
+    return ThreadPoolExecutor(max_workers=get_optimal_thread_count(), thread_name_prefix="utils-io")
+
+
+@functools.lru_cache(maxsize=None)
+def get_conversion_pool() -> ThreadPoolExecutor:
+    """
+    Thread pool shared by all image conversions, created on first use
+    
+    Reusing one pool saves starting a fresh set of worker threads for every
+    batch. concurrent.futures joins its worker threads before the interpreter
+    exits, queued conversions included, so call shutdown_conversion_pool when
+    the application closes.
+    """
+    return ThreadPoolExecutor(max_workers=get_optimal_thread_count(), thread_name_prefix="img-conv")
+
+
+def shutdown_conversion_pool() -> None:
+    """
+    Cancel the queued conversions and stop the shared pool, if it was started
+    
+    Does not wait: only the conversions already running are finished before
+    the interpreter can exit.
+    """
+    if get_conversion_pool.cache_info().currsize:
+        get_conversion_pool().shutdown(wait=False, cancel_futures=True)
+        get_conversion_pool.cache_clear()
+
+
+def _filter_chunk(file_paths: List[str]) -> List[str]:
+    """Keep the paths with an image extension that are regular files"""
+    # Check the extension first so only candidate images cost a stat call
+    return [file_path for file_path in file_paths
+            if _has_image_extension(file_path) and os.path.isfile(file_path)]
+
+
 class FileHandler:
     """Handles file operations and validations"""
     
-    # Image MIME types
-    IMAGE_MIME_TYPES = {
-        'image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/bmp',
-        'image/tiff', 'image/webp', 'image/avif', 'image/x-icon'
-    }
-    
     # Image file extensions
-    IMAGE_EXTENSIONS = {
-        '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif',
-        '.webp', '.avif', '.ico', '.ppm', '.pgm', '.pbm'
-    }
+    IMAGE_EXTENSIONS = IMAGE_EXTENSIONS
+    
+    # Units used by format_file_size
+    SIZE_UNITS = ("B", "KB", "MB", "GB")
+    
+    # Seconds a get_available_space result is reused before it is refreshed
+    DISK_SPACE_TTL = 2.0
     
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
+        self.logger = _logger
+        self._disk_space_cache: Dict[str, Tuple[float, Optional[int]]] = {}  # folder -> (time, bytes)
         
     def is_image_file(self, file_path: str) -> bool:
         """
@@ -38,21 +142,11 @@ class FileHandler:
             bool: True if the file is an image, False otherwise
         """
         try:
-            # Check file extension
-            file_ext = Path(file_path).suffix.lower()
-            if file_ext not in self.IMAGE_EXTENSIONS:
-                return False
-                
-            # Check MIME type
-            mime_type, _ = mimetypes.guess_type(file_path)
-            if mime_type and mime_type in self.IMAGE_MIME_TYPES:
-                return True
-                
-            # If MIME type check fails, rely on extension
-            return file_ext in self.IMAGE_EXTENSIONS
+            # The extension decides on its own; no MIME lookup needed
+            return _has_image_extension(file_path)
             
         except Exception as e:
-            self.logger.error(f"Error checking if {file_path} is an image: {str(e)}")
+            self.logger.error("Error checking if %s is an image: %s", file_path, e)
             return False
             
     def get_file_size(self, file_path: str) -> Optional[int]:
@@ -60,7 +154,7 @@ class FileHandler:
         try:
             return os.path.getsize(file_path)
         except Exception as e:
-            self.logger.error(f"Error getting file size for {file_path}: {str(e)}")
+            self.logger.error("Error getting file size for %s: %s", file_path, e)
             return None
             
     def format_file_size(self, size_bytes: int) -> str:
@@ -68,23 +162,22 @@ class FileHandler:
         if size_bytes == 0:
             return "0 B"
             
-        size_names = ["B", "KB", "MB", "GB"]
-        i = 0
-        size = float(size_bytes)
+        # Each unit is 2**10 larger, so the bit length picks the unit directly
+        i = min((size_bytes.bit_length() - 1) // 10, len(self.SIZE_UNITS) - 1)
+        size = size_bytes / (1 << (10 * i))
         
-        while size >= 1024.0 and i < len(size_names) - 1:
-            size /= 1024.0
-            i += 1
-            
-        return f"{size:.1f} {size_names[i]}"
+        return f"{size:.1f} {self.SIZE_UNITS[i]}"
         
     def validate_output_folder(self, folder_path: str) -> bool:
         """Validate if the output folder is writable"""
         try:
-            if not os.path.exists(folder_path):
-                os.makedirs(folder_path, exist_ok=True)
+            os.makedirs(folder_path, exist_ok=True)
+            if os.access(folder_path, os.W_OK):
+                return True
+            if os.name != 'nt':
+                return False
                 
-            # Test write permissions
+            # On Windows os.access ignores ACLs, so confirm a refusal with a test write
             test_file = os.path.join(folder_path, '.test_write_permissions')
             try:
                 with open(test_file, 'w') as f:
@@ -95,63 +188,131 @@ class FileHandler:
                 return False
                 
         except Exception as e:
-            self.logger.error(f"Error validating output folder {folder_path}: {str(e)}")
+            self.logger.error("Error validating output folder %s: %s", folder_path, e)
             return False
             
     def get_available_space(self, folder_path: str) -> Optional[int]:
-        """Get available disk space in bytes for the given folder"""
+        """
+        Get available disk space in bytes for the given folder
+        
+        The first query for a folder blocks. After that the last value is
+        returned straight away; once it is older than DISK_SPACE_TTL a refresh
+        runs on the I/O thread pool, so a slow disk or network share never
+        stalls the caller (typically the Tk thread).
+        """
+        now = time.monotonic()
+        cached = self._disk_space_cache.get(folder_path)
+        if cached is None:
+            free_bytes = self._query_available_space(folder_path)
+            self._disk_space_cache[folder_path] = (time.monotonic(), free_bytes)
+            return free_bytes
+            
+        checked_at, free_bytes = cached
+        if now - checked_at >= self.DISK_SPACE_TTL:
+            # Restart the clock now so only one refresh is in flight per folder
+            self._disk_space_cache[folder_path] = (now, free_bytes)
+            future = _io_pool().submit(self._query_available_space, folder_path)
+            future.add_done_callback(functools.partial(self._store_available_space, folder_path))
+        return free_bytes
+        
+    def _store_available_space(self, folder_path: str, future) -> None:
+        """Cache the result of a background available space query"""
+        self._disk_space_cache[folder_path] = (time.monotonic(), future.result())
+        
+    def _query_available_space(self, folder_path: str) -> Optional[int]:
+        """Ask the operating system for the free space of folder_path"""
         try:
             if os.name == 'nt':  # Windows
-                import ctypes
+                # A failed call raises through errcheck instead of reporting 0 bytes
                 free_bytes = ctypes.c_ulonglong(0)
-                ctypes.windll.kernel32.GetDiskFreeSpaceExW(
-                    ctypes.c_wchar_p(folder_path),
-                    ctypes.pointer(free_bytes),
-                    None,
-                    None
-                )
+                _GetDiskFreeSpaceExW(folder_path, ctypes.byref(free_bytes), None, None)
                 return free_bytes.value
             else:  # Unix/Linux/macOS
                 statvfs = os.statvfs(folder_path)
-                return statvfs.f_frsize * statvfs.f_available
+                return statvfs.f_frsize * statvfs.f_bavail
                 
         except Exception as e:
-            self.logger.error(f"Error getting available space for {folder_path}: {str(e)}")
+            self.logger.error("Error getting available space for %s: %s", folder_path, e)
             return None
             
     def filter_image_files(self, file_paths: List[str]) -> List[str]:
         """Filter a list of file paths to only include valid image files"""
-        image_files = []
-        for file_path in file_paths:
-            if os.path.isfile(file_path) and self.is_image_file(file_path):
-                image_files.append(file_path)
-        return image_files
+        if len(file_paths) <= _FILTER_CHUNK_SIZE:
+            return _filter_chunk(file_paths)
+            
+        # os.stat releases the GIL, so chunks checked on a thread pool overlap
+        # their file system waits; map keeps the results in input order
+        chunks = [file_paths[start:start + _FILTER_CHUNK_SIZE]
+                  for start in range(0, len(file_paths), _FILTER_CHUNK_SIZE)]
+        return [file_path for chunk in _io_pool().map(_filter_chunk, chunks) for file_path in chunk]
+        
+    def scan_directory(self, folder: str) -> Iterator[str]:
+        """
+        Yield the paths of the image files directly inside folder
+        
+        The file type comes from the directory listing itself, so no file
+        is stat'ed separately.
+        """
+        for entry in self._scan_image_entries(folder):
+            yield entry.path
+            
+    def stat_directory(self, folder: str) -> List[Tuple[str, os.stat_result]]:
+        """
+        List the image files directly inside folder as (path, stat) pairs, in name order
+        
+        On Windows the stat results come from the directory listing; elsewhere
+        each costs one stat call, for image files only.
+        """
+        entries = []
+        for entry in self._scan_image_entries(folder):
+            # Skip files that vanished or can't be read, keeping the rest
+            try:
+                entries.append((entry.path, entry.stat()))
+            except OSError as e:
+                self.logger.warning("Could not read %s: %s", entry.path, e)
+        entries.sort()
+        return entries
+        
+    def _scan_image_entries(self, folder: str) -> Iterator[os.DirEntry]:
+        """Yield the DirEntry of each image file directly inside folder"""
+        try:
+            with os.scandir(folder) as scan:
+                for entry in scan:
+                    if _has_image_extension(entry.name) and entry.is_file():
+                        yield entry
+        except OSError as e:
+            self.logger.error("Error scanning folder %s: %s", folder, e)
         
 
 class ProgressTracker:
     """Tracks conversion progress and statistics"""
     
+    # Minimum seconds between two progress updates reported by should_emit
+    EMIT_INTERVAL = 0.05
+    
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
+        self.logger = _logger
         self.reset()
         
     def reset(self):
         """Reset all progress tracking"""
         self.total_files = 0
+        self._inv_total = 0.0  # 1 / total_files, or 0.0 while there are no files
         self.processed_files = 0
         self.successful_conversions = 0
         self.failed_conversions = 0
         self.current_file = ""
         self.start_time = None
         self.end_time = None
+        self._last_emit = 0.0
         
     def set_total_files(self, count: int):
         """Set the total number of files to process"""
         self.total_files = count
+        self._inv_total = 1.0 / count if count else 0.0
         
     def start_processing(self):
         """Mark the start of processing"""
-        import time
         self.start_time = time.time()
         
     def update_current_file(self, filename: str):
@@ -166,27 +327,34 @@ class ProgressTracker:
         else:
             self.failed_conversions += 1
             
+    def should_emit(self) -> bool:
+        """
+        Check whether a progress update should be shown now
+        
+        Returns True at most once per EMIT_INTERVAL, and always once the last
+        file has been processed, so a UI fed from this redraws at a bounded
+        rate however many files there are.
+        """
+        now = time.monotonic()
+        if now - self._last_emit >= self.EMIT_INTERVAL or self.processed_files >= self.total_files:
+            self._last_emit = now
+            return True
+        return False
+        
     def get_progress_percentage(self) -> float:
         """Get the current progress as a percentage"""
-        if self.total_files == 0:
-            return 0.0
-        return (self.processed_files / self.total_files) * 100
+        return self.processed_files * self._inv_total * 100
         
     def get_estimated_time_remaining(self) -> Optional[float]:
         """Get estimated time remaining in seconds"""
         if not self.start_time or self.processed_files == 0:
             return None
             
-        import time
         elapsed_time = time.time() - self.start_time
-        avg_time_per_file = elapsed_time / self.processed_files
-        remaining_files = self.total_files - self.processed_files
-        
-        return avg_time_per_file * remaining_files
+        return elapsed_time * (self.total_files - self.processed_files) / self.processed_files
         
     def finish_processing(self):
         """Mark the end of processing"""
-        import time
         self.end_time = time.time()
         
     def get_summary(self) -> Dict[str, Any]:
@@ -196,7 +364,7 @@ class ProgressTracker:
             'processed_files': self.processed_files,
             'successful_conversions': self.successful_conversions,
             'failed_conversions': self.failed_conversions,
-            'success_rate': (self.successful_conversions / max(self.total_files, 1)) * 100,
+            'success_rate': self.successful_conversions * self._inv_total * 100,
             'current_file': self.current_file,
         }
         
@@ -204,7 +372,6 @@ class ProgressTracker:
             summary['total_time'] = self.end_time - self.start_time
             summary['avg_time_per_file'] = summary['total_time'] / max(self.processed_files, 1)
         elif self.start_time:
-            import time
             summary['elapsed_time'] = time.time() - self.start_time
             
         return summary
@@ -215,7 +382,8 @@ class ConfigManager:
     
     def __init__(self, config_file: str = "config.json"):
         self.config_file = Path(config_file)
-        self.logger = logging.getLogger(__name__)
+        self._temp_file = self.config_file.with_name(self.config_file.name + '.tmp')
+        self.logger = _logger
         self.default_config = {
             'appearance_mode': 'dark',
             'default_output_format': 'PNG',
@@ -235,9 +403,8 @@ class ConfigManager:
             return self.default_config.copy()
             
         try:
-            import json
-            with open(self.config_file, 'r') as f:
-                loaded_config = json.load(f)
+            with open(self.config_file, 'rb') as f:
+                loaded_config = _json_loads(f.read())
                 
             # Merge with defaults to ensure all keys exist
             config = self.default_config.copy()
@@ -245,17 +412,20 @@ class ConfigManager:
             return config
             
         except Exception as e:
-            self.logger.error(f"Error loading config: {str(e)}")
+            self.logger.error("Error loading config: %s", e)
             return self.default_config.copy()
             
     def save_config(self):
         """Save current configuration to file"""
         try:
-            import json
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            # Write a temporary file in one call and rename it over the config,
+            # so a crash mid-write never leaves a truncated config behind
+            data = _json_dumps(self.config)
+            with open(self._temp_file, 'wb') as f:
+                f.write(data)
+            os.replace(self._temp_file, self.config_file)
         except Exception as e:
-            self.logger.error(f"Error saving config: {str(e)}")
+            self.logger.error("Error saving config: %s", e)
             
     def get(self, key: str, default=None):
         """Get a configuration value"""
@@ -274,24 +444,36 @@ def format_duration(seconds: float) -> str:
     """Format duration in seconds to human-readable format"""
     if seconds < 60:
         return f"{seconds:.1f}s"
-    elif seconds < 3600:
-        minutes = seconds // 60
-        secs = seconds % 60
-        return f"{int(minutes)}m {int(secs)}s"
+        
+    # Whole seconds only from here on, so integer divmod is enough
+    total_seconds = int(seconds)
+    if total_seconds < 3600:
+        minutes, secs = divmod(total_seconds, 60)
+        return f"{minutes}m {secs}s"
     else:
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        return f"{int(hours)}h {int(minutes)}m"
+        hours, rest = divmod(total_seconds, 3600)
+        return f"{hours}h {rest // 60}m"
 
 
 def validate_image_dimensions(width: int, height: int) -> bool:
     """Validate image dimensions"""
-    return (1 <= width <= 65535 and 1 <= height <= 65535)
+    return 1 <= width <= 65535 and 1 <= height <= 65535
+
+
+def visible_row_range(top: float, viewport_height: float, row_height: int, count: int) -> Tuple[int, int]:
+    """
+    Index range [first, last) of the fixed-height list rows that overlap a viewport
+    
+    top is the scroll offset of the viewport in pixels from the start of the list.
+    """
+    first = min(count, max(0, int(top // row_height)))
+    last = min(count, max(first, -int(-(top + viewport_height) // row_height)))
+    return first, last
 
 
+@functools.lru_cache(maxsize=1)
 def get_optimal_thread_count() -> int:
-    """Get optimal number of threads for image processing"""
-    import os
+    """Get optimal number of threads for image processing (computed once)"""
     try:
         # Use number of CPU cores, but cap at 8 for memory considerations
         return min(os.cpu_count() or 4, 8)